@@ -2,8 +2,10 @@
 NFO file generation for media files using pymediainfo
 """
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 try:
     from pymediainfo import MediaInfo
@@ -13,10 +15,52 @@ except ImportError:
     PYMEDIAINFO_AVAILABLE = False
 
 from .models import TorrentData
+from .utils import content_unchanged
 
 
 logger = logging.getLogger(__name__)
 
+# Section separators, built once instead of per generate_nfo_content call
+_HEADER_SEP = "=" * 60
+_SECTION_SEP_20 = "-" * 20
+_SECTION_SEP_25 = "-" * 25
+
+# Filesystem-invalid characters; runs collapse to a single underscore
+_INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]+')
+_UNDERSCORE_RUNS = re.compile(r'_{2,}')
+
+# Optional per-track attributes rendered as "  <label>: <value>" when present
+_VIDEO_FIELDS = (
+    ("Frame Rate", "frame_rate"),
+    ("Bitrate", "bit_rate"),
+    ("Bit Depth", "bit_depth"),
+    ("Scan Type", "scan_type"),
+    ("Color Space", "color_space"),
+    ("Chroma Subsampling", "chroma_subsampling"),
+)
+
+_AUDIO_FIELDS = (
+    ("Channels", "channel_s"),
+    ("Channel Layout", "channel_positions"),
+    ("Sampling Rate", "sampling_rate"),
+    ("Bit Depth", "bit_depth"),
+    ("Bitrate", "bit_rate"),
+    ("Language", "language"),
+    ("Title", "title"),
+)
+
+_TEXT_FIELDS = (
+    ("Language", "language"),
+    ("Title", "title"),
+)
+
+# Full attribute sets copied out of a parsed MediaInfo object; everything
+# else the parser holds can be released before the NFO text is built
+_GENERAL_ATTRS = ("format", "file_size", "duration", "overall_bit_rate", "frame_count")
+_VIDEO_ATTRS = ("codec", "format", "width", "height") + tuple(attr for _, attr in _VIDEO_FIELDS)
+_AUDIO_ATTRS = ("codec", "format") + tuple(attr for _, attr in _AUDIO_FIELDS)
+_TEXT_ATTRS = ("codec", "format") + tuple(attr for _, attr in _TEXT_FIELDS)
+
 
 class NFOGenerator:
     """Generate NFO files for media using pymediainfo"""
@@ -30,24 +74,50 @@ class NFOGenerator:
         nfo_content = self.generate_nfo_content(torrent_data, tmdb_data, media_file_path)
         
         nfo_file = output_dir / f"{self._sanitize_filename(torrent_data.name)}.nfo"
-        with open(nfo_file, 'w', encoding='utf-8') as f:
-            f.write(nfo_content)
-        
+        nfo_bytes = nfo_content.encode('utf-8')
+        if content_unchanged(nfo_file, nfo_bytes):
+            logger.debug(f"NFO file unchanged, skipping write: {nfo_file}")
+            return
+
+        with open(nfo_file, 'wb') as f:
+            f.write(nfo_bytes)
+
         logger.debug(f"Created NFO file: {nfo_file}")
     
+    def parse_many(self, paths: List[Path]) -> List:
+        """Parse multiple media files concurrently
+
+        MediaInfo.parse is implemented in native code and releases the GIL,
+        so multi-file torrents (e.g. episode packs) parse in parallel.
+        Results are returned in input order; files that fail to parse
+        yield None.
+        """
+        if not self.pymediainfo_available or not paths:
+            return []
+
+        def parse_one(path):
+            try:
+                return self._extract_minimal(MediaInfo.parse(str(path)))
+            except Exception as e:
+                logger.warning(f"Failed to parse media file {path}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+            return list(executor.map(parse_one, paths))
+
     def generate_nfo_content(self, torrent_data: TorrentData, tmdb_data: Optional[Dict], media_file_path: Optional[Path] = None) -> str:
         """Generate NFO file content with pymediainfo technical details"""
         nfo_lines = []
         
         # Header
-        nfo_lines.append(f"{'='*60}")
+        nfo_lines.append(_HEADER_SEP)
         nfo_lines.append(f"  {torrent_data.media_info.title}")
-        nfo_lines.append(f"{'='*60}")
+        nfo_lines.append(_HEADER_SEP)
         nfo_lines.append("")
-        
+
         # Basic metadata
         nfo_lines.append("BASIC INFORMATION")
-        nfo_lines.append("-" * 20)
+        nfo_lines.append(_SECTION_SEP_20)
         nfo_lines.append(f"Title: {torrent_data.media_info.title}")
         if torrent_data.media_info.year:
             nfo_lines.append(f"Year: {torrent_data.media_info.year}")
@@ -64,7 +134,7 @@ class NFOGenerator:
         # TMDB information
         if tmdb_data:
             nfo_lines.append("TMDB INFORMATION")
-            nfo_lines.append("-" * 20)
+            nfo_lines.append(_SECTION_SEP_20)
             nfo_lines.append(f"TMDB ID: {tmdb_data.get('tmdb_id', 'Unknown')}")
             if tmdb_data.get('imdb_id'):
                 nfo_lines.append(f"IMDB ID: {tmdb_data['imdb_id']}")
@@ -80,13 +150,24 @@ class NFOGenerator:
         
         # Detailed technical information using pymediainfo
         nfo_lines.append("TECHNICAL INFORMATION")
-        nfo_lines.append("-" * 25)
+        nfo_lines.append(_SECTION_SEP_25)
         
-        # Add detailed pymediainfo analysis if available
-        if media_file_path and media_file_path.exists() and self.pymediainfo_available:
+        # Add detailed pymediainfo analysis if available; the short-circuit
+        # skips the .exists() syscall entirely when pymediainfo is missing
+        have_media_info = (
+            self.pymediainfo_available
+            and media_file_path is not None
+            and media_file_path.exists()
+        )
+
+        if have_media_info:
             try:
                 media_info = MediaInfo.parse(str(media_file_path))
-                nfo_lines.extend(self._generate_technical_details_text(media_info))
+                details = self._extract_minimal(media_info)
+                # Release the parsed tracks before building the text; the
+                # MediaInfo object holds every raw attribute in memory
+                del media_info
+                nfo_lines.extend(self._generate_technical_details_text(details))
             except Exception as e:
                 logger.warning(f"Failed to parse media file with pymediainfo: {e}")
                 nfo_lines.append("pymediainfo analysis failed")
@@ -99,84 +180,104 @@ class NFOGenerator:
     
     def _generate_movie_nfo(self, torrent_data: TorrentData, tmdb_data: Optional[Dict]) -> str:
         """Generate movie NFO content"""
-        nfo = "<movie>\n"
-        nfo += f"  <title>{torrent_data.media_info.title}</title>\n"
-        
+        # Collected in a list and joined once; += on str re-copies the
+        # accumulated buffer on every append
+        parts = ["<movie>\n"]
+        parts.append(f"  <title>{torrent_data.media_info.title}</title>\n")
+
         if torrent_data.media_info.year:
-            nfo += f"  <year>{torrent_data.media_info.year}</year>\n"
-        
+            parts.append(f"  <year>{torrent_data.media_info.year}</year>\n")
+
         if tmdb_data:
-            nfo += f"  <plot>{tmdb_data.get('overview', '')}</plot>\n"
-            nfo += f"  <tmdbid>{tmdb_data.get('tmdb_id', '')}</tmdbid>\n"
-            
+            parts.append(f"  <plot>{tmdb_data.get('overview', '')}</plot>\n")
+            parts.append(f"  <tmdbid>{tmdb_data.get('tmdb_id', '')}</tmdbid>\n")
+
             if tmdb_data.get('imdb_id'):
-                nfo += f"  <imdbid>{tmdb_data['imdb_id']}</imdbid>\n"
-            
+                parts.append(f"  <imdbid>{tmdb_data['imdb_id']}</imdbid>\n")
+
             for genre in tmdb_data.get('genres', []):
-                nfo += f"  <genre>{genre}</genre>\n"
-            
+                parts.append(f"  <genre>{genre}</genre>\n")
+
             if tmdb_data.get('runtime'):
-                nfo += f"  <runtime>{tmdb_data['runtime']}</runtime>\n"
-            
+                parts.append(f"  <runtime>{tmdb_data['runtime']}</runtime>\n")
+
             if tmdb_data.get('vote_average'):
-                nfo += f"  <rating>{tmdb_data['vote_average']}</rating>\n"
-        
-        nfo += "</movie>\n"
-        return nfo
-    
+                parts.append(f"  <rating>{tmdb_data['vote_average']}</rating>\n")
+
+        parts.append("</movie>\n")
+        return "".join(parts)
+
     def _generate_episode_nfo(self, torrent_data: TorrentData, tmdb_data: Optional[Dict]) -> str:
         """Generate TV episode NFO content"""
-        nfo = "<episodedetails>\n"
-        nfo += f"  <title>{torrent_data.media_info.title}</title>\n"
-        
+        parts = ["<episodedetails>\n"]
+        parts.append(f"  <title>{torrent_data.media_info.title}</title>\n")
+
         if torrent_data.media_info.season:
-            nfo += f"  <season>{torrent_data.media_info.season}</season>\n"
-        
+            parts.append(f"  <season>{torrent_data.media_info.season}</season>\n")
+
         if torrent_data.media_info.episode:
-            nfo += f"  <episode>{torrent_data.media_info.episode}</episode>\n"
-        
+            parts.append(f"  <episode>{torrent_data.media_info.episode}</episode>\n")
+
         if tmdb_data:
-            nfo += f"  <plot>{tmdb_data.get('overview', '')}</plot>\n"
-            nfo += f"  <tmdbid>{tmdb_data.get('tmdb_id', '')}</tmdbid>\n"
-            
+            parts.append(f"  <plot>{tmdb_data.get('overview', '')}</plot>\n")
+            parts.append(f"  <tmdbid>{tmdb_data.get('tmdb_id', '')}</tmdbid>\n")
+
             for genre in tmdb_data.get('genres', []):
-                nfo += f"  <genre>{genre}</genre>\n"
-            
+                parts.append(f"  <genre>{genre}</genre>\n")
+
             if tmdb_data.get('episode_name'):
-                nfo += f"  <episodetitle>{tmdb_data['episode_name']}</episodetitle>\n"
-            
+                parts.append(f"  <episodetitle>{tmdb_data['episode_name']}</episodetitle>\n")
+
             if tmdb_data.get('vote_average'):
-                nfo += f"  <rating>{tmdb_data['vote_average']}</rating>\n"
-        
-        nfo += "</episodedetails>\n"
-        return nfo
+                parts.append(f"  <rating>{tmdb_data['vote_average']}</rating>\n")
+
+        parts.append("</episodedetails>\n")
+        return "".join(parts)
     
     def _sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for filesystem"""
-        # Remove invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        # Remove consecutive underscores
-        filename = '_'.join(filter(None, filename.split('_')))
-        
-        return filename
+        # Replace invalid characters, then collapse consecutive underscores
+        filename = _INVALID_FILENAME_CHARS.sub('_', filename)
+        return _UNDERSCORE_RUNS.sub('_', filename).strip('_')
     
-    def _generate_technical_details_text(self, media_info) -> list:
-        """Generate detailed technical information from pymediainfo as text"""
+    def _extract_minimal(self, media_info) -> Dict:
+        """Copy only the NFO-relevant fields out of a parsed MediaInfo object
+
+        The returned plain dicts let callers drop the full MediaInfo object
+        (and every raw attribute it carries) as soon as parsing is done.
+        """
+        general = media_info.general_tracks[0] if media_info.general_tracks else None
+
+        return {
+            'general': {attr: getattr(general, attr, None) for attr in _GENERAL_ATTRS} if general else None,
+            'video': [
+                {attr: getattr(track, attr, None) for attr in _VIDEO_ATTRS}
+                for track in media_info.video_tracks
+            ],
+            'audio': [
+                {attr: getattr(track, attr, None) for attr in _AUDIO_ATTRS}
+                for track in media_info.audio_tracks
+            ],
+            'text': [
+                {attr: getattr(track, attr, None) for attr in _TEXT_ATTRS}
+                for track in media_info.text_tracks
+            ],
+        }
+
+    def _generate_technical_details_text(self, details: Dict) -> list:
+        """Generate detailed technical information text from extracted fields"""
         lines = []
-        
+
         try:
             # General information
-            general = media_info.general_tracks[0] if media_info.general_tracks else None
+            general = details.get('general')
             if general:
-                lines.append(f"Container: {general.format or 'Unknown'}")
-                if general.file_size:
-                    lines.append(f"File Size: {general.file_size}")
-                if general.duration:
+                lines.append(f"Container: {general.get('format') or 'Unknown'}")
+                if general.get('file_size'):
+                    lines.append(f"File Size: {general['file_size']}")
+                if general.get('duration'):
                     # Convert duration from ms to readable format
-                    duration_ms = int(general.duration)
+                    duration_ms = int(general['duration'])
                     hours = duration_ms // 3600000
                     minutes = (duration_ms % 3600000) // 60000
                     seconds = (duration_ms % 60000) // 1000
@@ -184,67 +285,49 @@ class NFOGenerator:
                         lines.append(f"Duration: {hours:02d}:{minutes:02d}:{seconds:02d}")
                     else:
                         lines.append(f"Duration: {minutes:02d}:{seconds:02d}")
-                if general.overall_bit_rate:
-                    lines.append(f"Overall Bitrate: {general.overall_bit_rate}")
-                if general.frame_count:
-                    lines.append(f"Frame Count: {general.frame_count}")
+                if general.get('overall_bit_rate'):
+                    lines.append(f"Overall Bitrate: {general['overall_bit_rate']}")
+                if general.get('frame_count'):
+                    lines.append(f"Frame Count: {general['frame_count']}")
             lines.append("")
-            
+
             # Video tracks
-            for i, video in enumerate(media_info.video_tracks):
+            for i, video in enumerate(details.get('video', [])):
                 lines.append(f"Video Track {i+1}:")
-                lines.append(f"  Codec: {video.codec or 'Unknown'}")
-                lines.append(f"  Format: {video.format or 'Unknown'}")
-                if video.width and video.height:
-                    lines.append(f"  Resolution: {video.width}x{video.height}")
-                if video.frame_rate:
-                    lines.append(f"  Frame Rate: {video.frame_rate}")
-                if video.bit_rate:
-                    lines.append(f"  Bitrate: {video.bit_rate}")
-                if video.bit_depth:
-                    lines.append(f"  Bit Depth: {video.bit_depth}")
-                if video.scan_type:
-                    lines.append(f"  Scan Type: {video.scan_type}")
-                if video.color_space:
-                    lines.append(f"  Color Space: {video.color_space}")
-                if video.chroma_subsampling:
-                    lines.append(f"  Chroma Subsampling: {video.chroma_subsampling}")
+                lines.append(f"  Codec: {video.get('codec') or 'Unknown'}")
+                lines.append(f"  Format: {video.get('format') or 'Unknown'}")
+                if video.get('width') and video.get('height'):
+                    lines.append(f"  Resolution: {video['width']}x{video['height']}")
+                for label, attr in _VIDEO_FIELDS:
+                    value = video.get(attr)
+                    if value:
+                        lines.append(f"  {label}: {value}")
                 lines.append("")
-            
+
             # Audio tracks
-            for i, audio in enumerate(media_info.audio_tracks):
+            for i, audio in enumerate(details.get('audio', [])):
                 lines.append(f"Audio Track {i+1}:")
-                lines.append(f"  Codec: {audio.codec or 'Unknown'}")
-                lines.append(f"  Format: {audio.format or 'Unknown'}")
-                if audio.channel_s:
-                    lines.append(f"  Channels: {audio.channel_s}")
-                if audio.channel_positions:
-                    lines.append(f"  Channel Layout: {audio.channel_positions}")
-                if audio.sampling_rate:
-                    lines.append(f"  Sampling Rate: {audio.sampling_rate}")
-                if audio.bit_depth:
-                    lines.append(f"  Bit Depth: {audio.bit_depth}")
-                if audio.bit_rate:
-                    lines.append(f"  Bitrate: {audio.bit_rate}")
-                if audio.language:
-                    lines.append(f"  Language: {audio.language}")
-                if audio.title:
-                    lines.append(f"  Title: {audio.title}")
+                lines.append(f"  Codec: {audio.get('codec') or 'Unknown'}")
+                lines.append(f"  Format: {audio.get('format') or 'Unknown'}")
+                for label, attr in _AUDIO_FIELDS:
+                    value = audio.get(attr)
+                    if value:
+                        lines.append(f"  {label}: {value}")
                 lines.append("")
-            
+
             # Text tracks (subtitles)
-            for i, text in enumerate(media_info.text_tracks):
+            for i, text in enumerate(details.get('text', [])):
                 lines.append(f"Subtitle Track {i+1}:")
-                lines.append(f"  Codec: {text.codec or 'Unknown'}")
-                lines.append(f"  Format: {text.format or 'Unknown'}")
-                if text.language:
-                    lines.append(f"  Language: {text.language}")
-                if text.title:
-                    lines.append(f"  Title: {text.title}")
+                lines.append(f"  Codec: {text.get('codec') or 'Unknown'}")
+                lines.append(f"  Format: {text.get('format') or 'Unknown'}")
+                for label, attr in _TEXT_FIELDS:
+                    value = text.get(attr)
+                    if value:
+                        lines.append(f"  {label}: {value}")
                 lines.append("")
-        
+
         except Exception as e:
             logger.warning(f"Error generating technical details: {e}")
             lines.append(f"Error generating technical details: {e}")
-        
+
         return lines
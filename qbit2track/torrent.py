@@ -3,6 +3,7 @@ Torrent file creation and management
 """
 import json
 import logging
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional
@@ -11,11 +12,15 @@ import click
 import torf
 
 from .models import TorrentData
-from .utils import CustomJSONEncoder
+from .utils import CustomJSONEncoder, content_unchanged
 
 
 logger = logging.getLogger(__name__)
 
+# Filesystem-invalid characters; runs collapse to a single underscore
+_INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]+')
+_UNDERSCORE_RUNS = re.compile(r'_{2,}')
+
 
 class TorrentManager:
     """Handle torrent file creation and management"""
@@ -23,8 +28,15 @@ class TorrentManager:
     def __init__(self):
         pass
     
-    def create_torrent_file(self, torrent_data: TorrentData, output_dir: Path):
-        """Create new torrent file from existing data"""
+    def create_torrent_file(self, torrent_data: TorrentData, output_dir: Path,
+                            threads: Optional[int] = None):
+        """Create new torrent file from existing data
+
+        `threads` bounds the piece-hashing worker count; None lets torf
+        use one hasher per CPU core. Callers generating several torrents
+        concurrently should pass a share of the cores to avoid
+        oversubscribing the hashing pool.
+        """
         torrent_path = Path(torrent_data.content_path)
 
         # Create new torrent
@@ -44,7 +56,8 @@ class TorrentManager:
             torrent.trackers = [torrent_data.tracker]
 
         torrent_file = output_dir / f"{self._sanitize_filename(torrent_data.name)}.torrent"
-        logger.info(f"Creating torrent file: {torrent_file}")
+        # %-style formatting so the handler only renders when the level is enabled
+        logger.info("Creating torrent file: %s", torrent_file)
         
         # Generate torrent with progress bar
         with click.progressbar(length=100, label='Creating torrent') as bar:
@@ -58,8 +71,11 @@ class TorrentManager:
                     bar.update(progress - current_progress)
                     current_progress = progress
             
-            # Generation phase (0-90%)
-            torrent.generate(callback=progress_callback, interval=1)
+            # Generation phase (0-90%); a wider callback interval keeps the
+            # hashing loop from pausing for progress updates on fast disks.
+            # torf overlaps a reader thread with the hasher pool, so disk
+            # reads and SHA1 run concurrently
+            torrent.generate(threads=threads, callback=progress_callback, interval=5)
 
             # Finish hashing portion
             if current_progress < 98:
@@ -71,28 +87,64 @@ class TorrentManager:
             torrent.write(torrent_file)
             bar.update(1)  # Complete
 
-        logger.info(f"Created torrent: {torrent_file}")
+        logger.info("Created torrent: %s", torrent_file)
         return torrent_file
     
     def _sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for filesystem"""
-        # Remove invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        # Remove consecutive underscores
-        filename = '_'.join(filter(None, filename.split('_')))
-        
-        return filename
+        # Replace invalid characters, then collapse consecutive underscores
+        filename = _INVALID_FILENAME_CHARS.sub('_', filename)
+        return _UNDERSCORE_RUNS.sub('_', filename).strip('_')
 
 
 class MetadataManager:
     """Handle metadata JSON files"""
-    
+
     def __init__(self):
         pass
-    
+
+    @staticmethod
+    def _files_to_columns(files) -> Dict:
+        """Convert per-file record dicts to a columnar layout
+
+        Large multi-file torrents repeat the same keys for every record;
+        storing one list per key keeps the JSON proportionally smaller.
+        """
+        if not files:
+            return {}
+
+        # Union of keys across all records (dicts keep first-seen order),
+        # so a key present only in later records is not silently dropped
+        keys = {key: None for file_entry in files for key in file_entry}
+        columns = {key: [] for key in keys}
+        for file_entry in files:
+            for key, values in columns.items():
+                values.append(file_entry.get(key))
+        return columns
+
+    @staticmethod
+    def _columns_to_files(columns: Dict) -> list:
+        """Pivot a columnar files layout back to per-file record dicts"""
+        if not columns:
+            return []
+
+        keys = list(columns.keys())
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+    @classmethod
+    def expand_files(cls, metadata: Dict) -> Dict:
+        """Re-expand a columnar 'files' layout to per-file records in place
+
+        Single owner of the columnar schema: readers that parse
+        metadata.json themselves (the upload paths use orjson directly)
+        route through here instead of duplicating the pivot. Older
+        metadata files already store a list and pass through as-is.
+        """
+        files = metadata.get('files')
+        if isinstance(files, dict):
+            metadata['files'] = cls._columns_to_files(files)
+        return metadata
+
     def save_metadata(self, torrent_data: TorrentData, output_dir: Path, tmdb_data: Optional[Dict]):
         """Save complete metadata as JSON"""
         metadata = {
@@ -110,13 +162,21 @@ class MetadataManager:
             },
             'media_info': torrent_data.media_info,
             'tmdb_data': tmdb_data,
-            'files': torrent_data.files
+            'files': self._files_to_columns(torrent_data.files)
         }
         
         metadata_file = output_dir / "metadata.json"
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, cls=CustomJSONEncoder, ensure_ascii=False)
-        
+        metadata_bytes = json.dumps(
+            metadata, indent=2, cls=CustomJSONEncoder, ensure_ascii=False
+        ).encode('utf-8')
+
+        if content_unchanged(metadata_file, metadata_bytes):
+            logger.debug(f"Metadata unchanged, skipping write: {metadata_file}")
+            return
+
+        with open(metadata_file, 'wb') as f:
+            f.write(metadata_bytes)
+
         logger.debug(f"Saved metadata: {metadata_file}")
     
     def load_metadata(self, metadata_file: Path) -> Dict:
@@ -125,4 +185,6 @@ class MetadataManager:
         
         with open(metadata_file, 'r', encoding='utf-8') as f:
             # Use object_hook to decode datetime strings
-            return json.load(f, object_hook=custom_json_decoder)
+            metadata = json.load(f, object_hook=custom_json_decoder)
+
+        return self.expand_files(metadata)
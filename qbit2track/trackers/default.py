@@ -1,6 +1,26 @@
+import functools
+import logging
+from pathlib import Path
 from typing import Dict, Any
+
+import yaml
+
 from ..uploader import UploadResult
 
+
+logger = logging.getLogger(__name__)
+
+# libyaml's C loader is ~10x faster than the pure-Python parser when available
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_yaml(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML file, cached by (path, mtime) so unchanged files parse once"""
+    with open(path_str, 'rb') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
 class DefaultUploader:
 
     def __init__(self):
@@ -8,22 +28,24 @@ class DefaultUploader:
 
     def _load_default_config(self) -> Dict[str, Any]:
         """Load Default configuration from YAML file"""
-        config_file = Path(__file__).parent / "config" / "default.yaml"
-        
+        config_file = Path(__file__).parent / "config" / "default.yml"
+
         if not config_file.exists():
             logger.warning(f"Default config file not found: {config_file}")
             return {}
-        
+
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-            
-            logger.info(f"Loaded Default configuration from {config_file}")
-            return config
-            
+            config = _load_yaml(str(config_file), config_file.stat().st_mtime_ns)
+
+            # Get the default tracker section, mirroring the tracker-specific loaders
+            default_config = config.get('api_configs', {}).get('default', {})
+
+            logger.debug(f"Loaded Default configuration from {config_file}")
+            return default_config
+
         except Exception as e:
             logger.error(f"Failed to load Default config: {e}")
             return {}
 
     def upload_torrent(self, torrent_data: Dict[str, Any], files: Dict[str, Any]) -> UploadResult:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
@@ -1,20 +1,33 @@
 """
 La Cale tracker uploader implementation
 """
+import copy
+import functools
+import io
 import json
 import logging
+import mmap
+import os
+import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any
 
 import requests
+from requests.adapters import HTTPAdapter
+import torf
 import yaml
-from jinja2 import Environment, FileSystemLoader, Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader, Template
 
 from ..config import Config
 from ..models import TorrentData
 from ..naming import NamingContext
+from ..torrent import MetadataManager
 from ..uploader import RateLimiter, UploadResult
 
 from .default import DefaultUploader
@@ -22,6 +35,170 @@ from .default import DefaultUploader
 
 logger = logging.getLogger(__name__)
 
+# bencode2's C parser decodes torrent files faster than torf's pure-Python
+# one; optional, torf (a hard dependency) covers the fallback
+try:
+    import bencode2
+except ImportError:
+    bencode2 = None
+
+# orjson decodes large metadata files several times faster than the stdlib;
+# fall back transparently when it is not installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# libyaml's C loader is ~10x faster than the pure-Python parser when available
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Parsed YAML configs shared across uploader instances, keyed by
+# (resolved path, mtime_ns, size) so edits invalidate naturally
+_CONFIG_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_CONFIG_CACHE_MAX = 16
+
+# Resolved once at import; the templates never move at runtime
+_TEMPLATES_DIR = Path(__file__).parent / "templates" / "lacale"
+
+
+def _cache_dir() -> Path:
+    """Per-user cache directory shared by the La Cale disk caches"""
+    return Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'qbit2track'
+
+
+def _open_upload_file(path: Path):
+    """Open a file for multipart upload without copying it into memory
+
+    Returns a read-only mmap that urllib3 streams from directly; the
+    underlying descriptor can be closed immediately since the mapping
+    keeps the pages alive. Empty files (which mmap rejects) fall back to
+    an in-memory buffer.
+    """
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return io.BytesIO(f.read())
+
+@functools.lru_cache(maxsize=256)
+def _torrent_source(path_str: str, mtime_ns: int) -> str:
+    """Read the info.source field of a torrent file, cached by (path, mtime)"""
+    if bencode2 is not None:
+        with open(path_str, 'rb') as f:
+            meta = bencode2.bdecode(f.read())
+        source = meta.get(b'info', {}).get(b'source', b'')
+        return source.decode('utf-8', 'replace') if source else ''
+
+    torrent = torf.Torrent.read(path_str, validate=False)
+    return torrent.source or ''
+
+
+# Static La Cale mapping tables, shared read-only across uploader
+# instances instead of being rebuilt on every construction
+
+# La Cale specific category mappings based on actual API
+_CATEGORY_MAPPING = MappingProxyType({
+    "movie": "cmjoyv2cd00027eryreyk39gz",      # Films
+    "tvshow": "cmjoyv2dg00067ery8m6c3q8h",     # Séries TV
+    "anime": "cmjoyv2d900057eryz5xw65xc"        # Animation (sub-category of Films)
+})
+
+# Resolution mappings based on La Cale tags
+_RESOLUTION_MAPPING = MappingProxyType({
+    "480p": "480p",
+    "576p": "576p",
+    "720p": "720p",
+    "1080p": "1080p",
+    "2160p": "2160p",
+    "4k": "2160p",
+    "sd": "sd"
+})
+
+# Video codec mappings based on La Cale ungrouped tags
+_VIDEO_CODEC_MAPPING = MappingProxyType({
+    "x264": "d5cl1va7302s73ah0hbg",  # H264
+    "x265": "d5cl21a7302s73ah0hf0",  # H265
+    "hevc": "d5cl22i7302s73ah0hh0",  # HEVC
+    "h264": "d5cl1va7302s73ah0hbg",
+    "h265": "d5cl21a7302s73ah0hf0",
+    "avc": "d5cl1va7302s73ah0hbg",
+    "vc-1": "vc1",
+    "mpeg2": "mpeg2"
+})
+
+# Audio codec mappings (common codec names)
+_AUDIO_CODEC_MAPPING = MappingProxyType({
+    "ac3": "ac3",
+    "dts": "dts",
+    "aac": "aac",
+    "flac": "flac",
+    "truehd": "truehd",
+    "eac3": "eac3",
+    "opus": "opus",
+    "mp3": "mp3",
+    "m4a": "m4a"
+})
+
+# Language mappings (French tracker, so French language names)
+_LANGUAGE_MAPPING = MappingProxyType({
+    "en": "VO",           # Version Originale (English)
+    "fr": "VF",           # Version Française
+    "es": "espagnol",
+    "de": "allemand",
+    "it": "italien",
+    "pt": "portugais",
+    "ru": "russe",
+    "ja": "japonais",
+    "ko": "coréen",
+    "zh": "chinois",
+    "ar": "arabe",
+    "hi": "hindi",
+    "la": "latin",
+    "sv": "suédois",
+    "no": "norvégien",
+    "da": "danois",
+    "nl": "néerlandais",
+    "fi": "finnois"
+})
+
+# Genre mappings from TMDB to common tracker genres (French)
+_GENRE_MAPPING = MappingProxyType({
+    "Action": "action",
+    "Adventure": "aventure",
+    "Animation": "animation",
+    "Comedy": "comedie",
+    "Crime": "polar",
+    "Documentary": "documentaire",
+    "Drama": "drame",
+    "Family": "famille",
+    "Fantasy": "fantastique",
+    "Horror": "horreur",
+    "Mystery": "polar",
+    "Romance": "romance",
+    "Science Fiction": "science-fiction",
+    "Thriller": "thriller",
+    "War": "guerre",
+    "Western": "western",
+    "History": "historique",
+    "Music": "musique",
+    "TV Movie": "telefilm"
+})
+
+# Content type mappings
+_CONTENT_TYPE_MAPPING = MappingProxyType({
+    "movie": "cmjudwpgn0016uyruja14d0fu",     # Film
+    "tvshow": "cmjoyv2dg00067ery8m6c3q8h",  # TV shows don't have a specific content type tag
+    "anime": "cmjudwprl0017uyrusdiye36d",     # Film d'animation
+    "documentary": "documentaire",
+    "spectacle": "cmjudwq2v0018uyruhuylsy3q"   # Spectacle
+})
+
+# Canonical HDR labels seen in media info; resolved against the live tag
+# set once per meta refresh
+_HDR_LABELS = ("hdr", "hdr10", "hdr10+", "dv", "dolby vision", "hlg")
+
+
 @dataclass
 class LaCaleMeta:
     """La Cale metadata from /api/external/meta"""
@@ -33,10 +210,15 @@ class LaCaleUploader(DefaultUploader):
     """Specialized uploader for La Cale tracker"""
     
     def __init__(self, passkey: str, config_path: Optional[str] = None):
+        super().__init__()
         self.passkey = passkey
         self.config = self._load_config(config_path)
         self.templates = self._load_templates()
         self.session = requests.Session()
+        # Keep-alive pooling so mass uploads reuse the TCP/TLS connection
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.rate_limiter = RateLimiter(
             requests_per_minute=self.config.get('retry', {}).get('max_attempts', 3),
             burst_size=5
@@ -45,105 +227,36 @@ class LaCaleUploader(DefaultUploader):
         # Initialize naming context
         app_config = Config()
         self.naming_context = NamingContext(app_config)
+        self._meta_cache = None
+        self._meta_cache_time = 0.0
         self._meta_cache_duration = 3600  # Cache for 1 hour
+        # Serializes meta refreshes so concurrent mass-upload workers
+        # don't issue duplicate fetches or tear the derived caches
+        self._meta_lock = threading.Lock()
+
+        # Tag caches derived from the fetched meta; rebuilt on meta refresh
+        self._tags_cache: Optional[Dict[str, str]] = None
+        self._lower_tag_index: Optional[Dict[str, str]] = None
+        self._lower_tag_items: Optional[List] = None
+        self._static_tag_lookup: Optional[Dict[str, str]] = None
+        self._tag_alternation: Optional[re.Pattern] = None
+        self._valid_content_type: Optional[Dict[str, str]] = None
+        self._lang_code_to_tag_id: Optional[Dict[str, str]] = None
+        self._hdr_tag_cache: Optional[Dict[str, str]] = None
+        self._categories_cache: Optional[Dict[str, str]] = None
+        self._resolved_category_ids: Optional[Dict[str, str]] = None
         
-        # La Cale specific category mappings based on actual API
-        self._category_mapping = {
-            "movie": "cmjoyv2cd00027eryreyk39gz",      # Films
-            "tvshow": "cmjoyv2dg00067ery8m6c3q8h",     # Séries TV
-            "anime": "cmjoyv2d900057eryz5xw65xc"        # Animation (sub-category of Films)
-        }
-        
-        # Resolution mappings based on La Cale tags
-        self._resolution_mapping = {
-            "480p": "480p",
-            "576p": "576p", 
-            "720p": "720p",
-            "1080p": "1080p",
-            "2160p": "2160p",
-            "4k": "2160p",
-            "sd": "sd"
-        }
-        
-        # Video codec mappings based on La Cale ungrouped tags
-        self._video_codec_mapping = {
-            "x264": "d5cl1va7302s73ah0hbg",  # H264
-            "x265": "d5cl21a7302s73ah0hf0",  # H265
-            "hevc": "d5cl22i7302s73ah0hh0",  # HEVC
-            "h264": "d5cl1va7302s73ah0hbg",
-            "h265": "d5cl21a7302s73ah0hf0",
-            "avc": "d5cl1va7302s73ah0hbg",
-            "vc-1": "vc1",
-            "mpeg2": "mpeg2"
-        }
-        
-        # Audio codec mappings (common codec names)
-        self._audio_codec_mapping = {
-            "ac3": "ac3",
-            "dts": "dts",
-            "aac": "aac",
-            "flac": "flac",
-            "truehd": "truehd",
-            "eac3": "eac3",
-            "opus": "opus",
-            "mp3": "mp3",
-            "m4a": "m4a"
-        }
-        
-        # Language mappings (French tracker, so French language names)
-        self._language_mapping = {
-            "en": "VO",           # Version Originale (English)
-            "fr": "VF",           # Version Française
-            "es": "espagnol", 
-            "de": "allemand",
-            "it": "italien",
-            "pt": "portugais",
-            "ru": "russe",
-            "ja": "japonais",
-            "ko": "coréen",
-            "zh": "chinois",
-            "ar": "arabe",
-            "hi": "hindi",
-            "la": "latin",
-            "sv": "suédois",
-            "no": "norvégien",
-            "da": "danois",
-            "nl": "néerlandais",
-            "fi": "finnois"
-        }
-        
-        # Genre mappings from TMDB to common tracker genres (French)
-        self._genre_mapping = {
-            "Action": "action",
-            "Adventure": "aventure", 
-            "Animation": "animation",
-            "Comedy": "comedie",
-            "Crime": "polar",
-            "Documentary": "documentaire",
-            "Drama": "drame",
-            "Family": "famille",
-            "Fantasy": "fantastique",
-            "Horror": "horreur",
-            "Mystery": "polar",
-            "Romance": "romance",
-            "Science Fiction": "science-fiction",
-            "Thriller": "thriller",
-            "War": "guerre",
-            "Western": "western",
-            "History": "historique",
-            "Music": "musique",
-            "TV Movie": "telefilm"
-        }
-        
-        # Content type mappings
-        self._content_type_mapping = {
-            "movie": "cmjudwpgn0016uyruja14d0fu",     # Film
-            "tvshow": "cmjoyv2dg00067ery8m6c3q8h",  # TV shows don't have a specific content type tag
-            "anime": "cmjudwprl0017uyrusdiye36d",     # Film d'animation
-            "documentary": "documentaire",
-            "spectacle": "cmjudwq2v0018uyruhuylsy3q"   # Spectacle
-        }
-    
+        # Static mapping tables live at module level and are shared
+        # read-only across instances; instance attributes stay for
+        # API compatibility
+        self._category_mapping = _CATEGORY_MAPPING
+        self._resolution_mapping = _RESOLUTION_MAPPING
+        self._video_codec_mapping = _VIDEO_CODEC_MAPPING
+        self._audio_codec_mapping = _AUDIO_CODEC_MAPPING
+        self._language_mapping = _LANGUAGE_MAPPING
+        self._genre_mapping = _GENRE_MAPPING
+        self._content_type_mapping = _CONTENT_TYPE_MAPPING
+
     def _load_config(self, config_path: Optional[str]) -> Dict[str, Any]:
         """Load La Cale configuration from YAML file"""
         if config_path:
@@ -157,16 +270,28 @@ class LaCaleUploader(DefaultUploader):
             return {}
         
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-            
-            # Get La Cale specific configuration
+            stat = config_file.stat()
+            cache_key = (str(config_file.resolve()), stat.st_mtime_ns, stat.st_size)
+
+            config = _CONFIG_CACHE.get(cache_key)
+            if config is None:
+                with open(config_file, 'r', encoding='utf-8') as f:
+                    config = yaml.load(f, Loader=_YAML_LOADER)
+
+                _CONFIG_CACHE[cache_key] = config
+                if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+                    _CONFIG_CACHE.popitem(last=False)
+            else:
+                _CONFIG_CACHE.move_to_end(cache_key)
+
+            # Get La Cale specific configuration; deepcopy so instances
+            # can't mutate the shared cached tree
             api_configs = config.get('api_configs', {})
-            la_cale_config = api_configs.get('la_cale', {})
-            
+            la_cale_config = copy.deepcopy(api_configs.get('la_cale', {}))
+
             logger.info(f"Loaded La Cale configuration from {config_file}")
             return la_cale_config
-            
+
         except Exception as e:
             logger.error(f"Failed to load La Cale config: {e}")
             return {}
@@ -174,24 +299,32 @@ class LaCaleUploader(DefaultUploader):
     def _load_templates(self) -> Dict[str, Template]:
         """Load Jinja2 templates for La Cale"""
         templates = {}
-        
+
+        # Pre-compile torrent-name templates once per uploader; config
+        # entries override the defaults per media type
+        name_templates = dict(self.default_config.get('torrent_names', {}) or {})
+        name_templates.update(self.config.get('torrent_names', {}) or {})
+
+        self._name_templates: Dict[str, Template] = {}
+        for media_type, template_str in name_templates.items():
+            if not template_str:
+                continue
+            try:
+                self._name_templates[media_type] = Template(template_str)
+            except Exception as e:
+                logger.warning(f"Failed to compile torrent name template for {media_type}: {e}")
+
         try:
-            # Get templates directory - new location in trackers/templates
-            templates_dir = Path(__file__).parent / "templates" / "lacale"
-            
+            # Templates directory - new location in trackers/templates
+            templates_dir = _TEMPLATES_DIR
+
             if not templates_dir.exists():
                 logger.warning(f"Templates directory not found: {templates_dir}")
                 return templates
-            
+
             # Setup Jinja2 environment
-            env = Environment(
-                loader=FileSystemLoader(str(templates_dir)),
-                autoescape=True
-            )
-            
-            # Add custom filters
-            env.filters['filesizeformat'] = self._filesizeformat
-            
+            env = self._build_template_environment(templates_dir)
+
             # Load description template
             try:
                 templates['description'] = env.get_template('description.j2')
@@ -204,7 +337,56 @@ class LaCaleUploader(DefaultUploader):
         except Exception as e:
             logger.error(f"Failed to setup templates: {e}")
             return {}
-    
+
+    def _build_template_environment(self, templates_dir: Path) -> Environment:
+        """Build the Jinja2 environment, preferring precompiled templates
+
+        Templates are ahead-of-time compiled into a zip in the cache
+        directory; later processes load the pickled modules through
+        ModuleLoader and skip lexing and parsing entirely. The zip is
+        rebuilt whenever a template source is newer than it.
+        """
+        compiled_zip = _cache_dir() / "lacale_templates.zip"
+
+        def make_env(loader) -> Environment:
+            # Templates are static at runtime, so skip the per-render
+            # source mtime check and persist compiled bytecode across
+            # processes; cache setup failures are non-fatal
+            bytecode_cache = None
+            try:
+                bytecode_dir = _cache_dir() / "jinja_bytecode"
+                bytecode_dir.mkdir(parents=True, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(directory=str(bytecode_dir))
+            except OSError as e:
+                logger.debug(f"Could not set up Jinja bytecode cache: {e}")
+
+            env = Environment(
+                loader=loader,
+                autoescape=True,
+                auto_reload=False,
+                bytecode_cache=bytecode_cache
+            )
+            env.filters['filesizeformat'] = self._filesizeformat
+            return env
+
+        source_mtime = max(
+            (entry.stat().st_mtime for entry in templates_dir.iterdir()),
+            default=0.0
+        )
+        try:
+            if compiled_zip.stat().st_mtime > source_mtime:
+                return make_env(ModuleLoader(str(compiled_zip)))
+        except OSError:
+            pass
+
+        env = make_env(FileSystemLoader(str(templates_dir)))
+        try:
+            compiled_zip.parent.mkdir(parents=True, exist_ok=True)
+            env.compile_templates(str(compiled_zip), zip='deflated', log_function=logger.debug)
+        except OSError as e:
+            logger.debug(f"Could not precompile La Cale templates: {e}")
+        return env
+
     def _filesizeformat(self, size_bytes: Any) -> str:
         """Format file size in human readable format"""
         try:
@@ -223,17 +405,13 @@ class LaCaleUploader(DefaultUploader):
     def generate_torrent_name(self, naming_context: Dict[str, Any], torrent_data: Dict[str, Any]) -> str:
         """Generate torrent name using Jinja2 template"""
         try:
-            # Get template for media type
+            # Get precompiled template for media type
             media_type = naming_context.get('type', 'movie')
-            torrent_names = self.config.get('torrent_names', {})
-            
-            template_str = torrent_names.get(media_type)
-            if not template_str:
-                # Fallback to simple naming
-                template_str = self.default_config.get('torrent_names', {}).get(media_type) 
-            
+            template = self._name_templates.get(media_type)
+            if template is None:
+                raise ValueError(f"No torrent name template for media type: {media_type}")
+
             # Render template
-            template = Template(template_str)
             torrent_name = template.render(**naming_context)
 
             # Clean torrent name
@@ -293,86 +471,298 @@ class LaCaleUploader(DefaultUploader):
     
     def fetch_meta(self) -> LaCaleMeta:
         """Fetch metadata from La Cale API"""
-        # Check cache first
+        # Lock-free fast path: the meta and its derived caches are only
+        # ever replaced wholesale, never mutated in place
         now = time.time()
-        if (self._meta_cache and 
+        if (self._meta_cache and
             now - self._meta_cache_time < self._meta_cache_duration):
             return self._meta_cache
-        
-        self.rate_limiter.wait_if_needed()
-        
-        url = f"{self.base_url}/api/external/meta"
-        params = {"passkey": self.passkey}
-        
+
+        # Single-flight refresh: concurrent workers wait here instead of
+        # each issuing their own /api/external/meta request
+        with self._meta_lock:
+            now = time.time()
+            if (self._meta_cache and
+                now - self._meta_cache_time < self._meta_cache_duration):
+                return self._meta_cache
+
+            # Then the disk cache, so cold processes skip the HTTP round trip
+            meta = self._load_meta_disk_cache(now)
+            if meta is not None:
+                return meta
+
+            self.rate_limiter.wait_if_needed()
+
+            url = f"{self.base_url}/api/external/meta"
+            params = {"passkey": self.passkey}
+
+            try:
+                response = self.session.get(url, params=params, timeout=30)
+                response.raise_for_status()
+
+                data = response.json()
+                meta = LaCaleMeta(
+                    categories=data.get('categories', []),
+                    tag_groups=data.get('tagGroups', []),
+                    ungrouped_tags=data.get('ungroupedTags', [])
+                )
+                self._install_meta(meta, now)
+                self._save_meta_disk_cache(data)
+
+                logger.info("Successfully fetched La Cale metadata")
+                return meta
+
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Failed to fetch La Cale metadata: {e}")
+                raise ValueError(f"Meta fetch failed: {e}")
+
+    def _meta_disk_cache_path(self) -> Path:
+        return _cache_dir() / "lacale_meta.json"
+
+    def _load_meta_disk_cache(self, now: float) -> Optional[LaCaleMeta]:
+        """Load the meta from the on-disk cache if it is still fresh
+
+        Must be called with the meta lock held.
+        """
+        cache_path = self._meta_disk_cache_path()
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            self._meta_cache = LaCaleMeta(
+            if now - cache_path.stat().st_mtime >= self._meta_cache_duration:
+                return None
+
+            with open(cache_path, 'rb') as f:
+                data = _json_loads(f.read())
+
+            meta = LaCaleMeta(
                 categories=data.get('categories', []),
                 tag_groups=data.get('tagGroups', []),
                 ungrouped_tags=data.get('ungroupedTags', [])
             )
-            self._meta_cache_time = now
-            
-            logger.info("Successfully fetched La Cale metadata")
-            return self._meta_cache
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to fetch La Cale metadata: {e}")
-            raise ValueError(f"Meta fetch failed: {e}")
+            self._install_meta(meta, now)
+
+            logger.debug(f"Loaded La Cale metadata from disk cache: {cache_path}")
+            return meta
+
+        except (OSError, ValueError) as e:
+            logger.debug(f"La Cale meta disk cache unusable: {e}")
+            return None
+
+    def _save_meta_disk_cache(self, data: Dict[str, Any]):
+        """Persist the fetched meta for other processes; best effort"""
+        cache_path = self._meta_disk_cache_path()
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'categories': data.get('categories', []),
+                    'tagGroups': data.get('tagGroups', []),
+                    'ungroupedTags': data.get('ungroupedTags', [])
+                }, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.debug(f"Could not write La Cale meta disk cache: {e}")
     
     def get_categories(self) -> Dict[str, str]:
         """Get categories as id->name mapping"""
-        meta = self.fetch_meta()
-        categories = {}
-        
-        def add_category_with_children(category):
-            """Recursively add category and its children"""
-            categories[category['id']] = category['name']
-            if 'children' in category and category['children']:
-                for child in category['children']:
-                    add_category_with_children(child)
-        
-        for category in meta.categories:
-            add_category_with_children(category)
-        
-        return categories
-    
+        self.fetch_meta()
+        # Rebuilt by _install_meta whenever the meta refreshes
+        return self._categories_cache
+
     def get_tags(self) -> Dict[str, str]:
         """Get tags as id->name mapping"""
-        meta = self.fetch_meta()
+        self.fetch_meta()
+        # Rebuilt by _install_meta whenever the meta refreshes
+        return self._tags_cache
+
+    def _install_meta(self, meta: LaCaleMeta, now: float):
+        """Publish a freshly loaded meta and its derived caches
+
+        Must be called with the meta lock held. The derived structures
+        are rebuilt into fresh objects and swapped in by plain attribute
+        assignment, so workers running concurrent tag lookups always see
+        either the previous complete caches or the new ones — never a
+        half-invalidated state.
+        """
+        self._build_tags_caches(meta)
+        self._build_categories_caches(meta)
+        self._meta_cache = meta
+        self._meta_cache_time = now
+
+    def _build_categories_caches(self, meta: LaCaleMeta):
+        """Rebuild the category dict and the resolved media-type ids"""
+        categories = {}
+
+        # Walk the category tree iteratively; an explicit stack avoids the
+        # per-call overhead and recursion limit of the nested-function version
+        stack = list(meta.categories)
+        while stack:
+            category = stack.pop()
+            categories[category['id']] = category['name']
+            children = category.get('children')
+            if children:
+                stack.extend(children)
+
+        # Run the full media-type resolution once per refresh; per-torrent
+        # mapping then becomes a dict lookup
+        self._resolved_category_ids = {
+            media_type: category_id
+            for media_type in self._category_mapping
+            if (category_id := self._resolve_category_id(media_type, categories))
+        }
+        self._categories_cache = categories
+
+    def _build_tags_caches(self, meta: LaCaleMeta):
+        """Rebuild the tag dict and every cache derived from it"""
         tags = {}
-        
+
         # Add grouped tags
         for group in meta.tag_groups:
             if group.get('tags'):  # Check if tags exist and are not None
                 for tag in group['tags']:
                     tags[tag['id']] = tag['name']
-        
+
         # Add ungrouped tags
         for tag in meta.ungrouped_tags:
             tags[tag['id']] = tag['name']
-        
-        return tags
-    
+
+        self._build_tag_index(tags)
+        self._build_static_tag_lookup(tags)
+
+        # Content-type entries validated against the live tag set once,
+        # instead of per extracted torrent
+        self._valid_content_type = {
+            media_type: tag_id
+            for media_type, tag_id in self._content_type_mapping.items()
+            if tag_id in tags
+        }
+
+        # ISO code -> tag id resolved once per refresh; the language loop
+        # then skips both the name mapping and the tag scan
+        self._lang_code_to_tag_id = {
+            code: tag_id
+            for code, name in self._language_mapping.items()
+            if (tag_id := self._find_matching_tag_id(name, tags))
+        }
+
+        # HDR labels run the full variant resolution once here, so the
+        # per-torrent branch is a single dict probe
+        self._hdr_tag_cache = {
+            label: tag_id
+            for label in _HDR_LABELS
+            if (tag_id := self._resolve_hdr_tag_id(label, tags))
+        }
+
+        self._tags_cache = tags
+
+    def _build_tag_index(self, available_tags: Dict[str, str]):
+        """Build the lowercase name -> tag id index for O(1) exact matches"""
+        lower_index = {name.lower(): tag_id for tag_id, name in available_tags.items()}
+
+        # One alternation over all tag names finds name-in-query substring
+        # hits in a single C-level scan; longest names first so the most
+        # specific tag wins
+        names = sorted(lower_index, key=len, reverse=True)
+        if names:
+            alternation = re.compile('|'.join(re.escape(name) for name in names))
+        else:
+            alternation = None
+
+        self._lower_tag_index = lower_index
+        self._lower_tag_items = list(lower_index.items())
+        self._tag_alternation = alternation
+
+    def _build_static_tag_lookup(self, available_tags: Dict[str, str]):
+        """Resolve the static mapping values against the current tag set once
+
+        Every value in the genre/resolution/codec/language mappings is
+        matched a single time per meta refresh, so per-torrent extraction
+        becomes one dict probe instead of a scan over all tags.
+        """
+        lookup = {}
+        for mapping in (self._genre_mapping, self._resolution_mapping,
+                        self._audio_codec_mapping, self._language_mapping):
+            for value in mapping.values():
+                key = value.lower()
+                if key in lookup:
+                    continue
+                tag_id = self._find_matching_tag_id(key, available_tags)
+                if tag_id:
+                    lookup[key] = tag_id
+        self._static_tag_lookup = lookup
+
+    def _lookup_tag_id(self, tag_value: str, available_tags: Dict[str, str]) -> Optional[str]:
+        """Resolve a tag value, preferring the precomputed static lookup"""
+        tag_lower = tag_value.lower()
+        if self._static_tag_lookup is not None:
+            tag_id = self._static_tag_lookup.get(tag_lower)
+            if tag_id:
+                return tag_id
+        return self._find_tag_id_lower(tag_lower, available_tags)
+
     def _find_matching_tag_id(self, tag_value: str, available_tags: Dict[str, str]) -> Optional[str]:
-        """Find the best matching tag ID for a given value"""
-        # Direct match
+        """Find the best matching tag ID for a value of any case"""
+        return self._find_tag_id_lower(tag_value.lower(), available_tags)
+
+    def _find_tag_id_lower(self, tag_lower: str, available_tags: Dict[str, str]) -> Optional[str]:
+        """Find the best matching tag ID; tag_lower must already be lowercase"""
+        if self._lower_tag_index is not None:
+            # Direct match via prebuilt index
+            tag_id = self._lower_tag_index.get(tag_lower)
+            if tag_id:
+                return tag_id
+
+            # Tag-name-in-query direction in one scan via the alternation
+            if self._tag_alternation is not None:
+                match = self._tag_alternation.search(tag_lower)
+                if match:
+                    return self._lower_tag_index[match.group(0)]
+
+            # Remaining direction: query contained in a tag name
+            for tag_name, tag_id in self._lower_tag_items:
+                if tag_lower in tag_name:
+                    return tag_id
+
+            return None
+
+        # No index built (caller supplied an ad-hoc mapping): scan directly
         for tag_id, tag_name in available_tags.items():
-            if tag_name.lower() == tag_value.lower():
+            if tag_name.lower() == tag_lower:
                 return tag_id
-        
-        # Partial match
+
         for tag_id, tag_name in available_tags.items():
-            if tag_value.lower() in tag_name.lower() or tag_name.lower() in tag_value.lower():
+            name_lower = tag_name.lower()
+            if tag_lower in name_lower or name_lower in tag_lower:
                 return tag_id
-        
+
         return None
     
+    def _resolve_hdr_tag_id(self, hdr_value: str, available_tags: Dict[str, str]) -> Optional[str]:
+        """Resolve an HDR label to a tag id, trying its case variants"""
+        hdr_lower = hdr_value.lower()
+        hdr_variants = [
+            hdr_lower,
+            hdr_value.upper(),
+            f"HDR{hdr_value[2:]}" if hdr_lower.startswith('hdr') else hdr_value
+        ]
+        for hdr_variant in hdr_variants:
+            tag_id = self._find_matching_tag_id(hdr_variant, available_tags)
+            if tag_id:
+                return tag_id
+        return None
+
     def _map_category_id(self, media_type: str, available_categories: Dict[str, str]) -> Optional[str]:
         """Map media type to La Cale category ID using actual API categories"""
+        # Category ids are pre-resolved when the meta refreshes, so the
+        # per-torrent path is a single dict lookup
+        if self._resolved_category_ids is not None:
+            resolved = self._resolved_category_ids.get(media_type.lower())
+            if resolved:
+                return resolved
+
+        return self._resolve_category_id(media_type, available_categories)
+
+    def _resolve_category_id(self, media_type: str, available_categories: Dict[str, str]) -> Optional[str]:
+        """Resolve a media type against the category list (uncached path)"""
         # Use direct mapping to La Cale category IDs first
         direct_mapping = self._category_mapping.get(media_type.lower())
         if direct_mapping and direct_mapping in available_categories:
@@ -403,81 +793,100 @@ class LaCaleUploader(DefaultUploader):
     def _extract_tags_from_media_info(self, media_info: Dict[str, Any], available_tags: Dict[str, str]) -> List[str]:
         """Extract and map tags from media info using La Cale's actual tags"""
         tags = []
-        
+
+        # Lowercase each input exactly once; the *_lower helpers assume
+        # pre-lowered values, so no field is re-lowered per tag scan
+        video_codec = (media_info.get('video_codec') or '').lower()
+        audio_codec = (media_info.get('audio_codec') or '').lower()
+        source = (media_info.get('source') or '').lower()
+
         # Add content type tag (Film, Film d'animation, etc.)
         media_type = media_info.get('type', 'movie')
-        content_type_tag = self._content_type_mapping.get(media_type)
-        if content_type_tag and content_type_tag in available_tags:
-            tags.append(content_type_tag)
+        if self._valid_content_type is not None:
+            content_type_tag = self._valid_content_type.get(media_type)
+            if content_type_tag:
+                tags.append(content_type_tag)
+        else:
+            content_type_tag = self._content_type_mapping.get(media_type)
+            if content_type_tag and content_type_tag in available_tags:
+                tags.append(content_type_tag)
         
         # Add genre tags from TMDB
         if 'tmdb_info' in media_info and 'genres' in media_info['tmdb_info']:
             for genre in media_info['tmdb_info']['genres']:
-                mapped_genre = self._genre_mapping.get(genre, genre.lower())
-                tag_id = self._find_matching_tag_id(mapped_genre, available_tags)
+                # Mapping values are tag names, resolved via the
+                # name-keyed static lookup inside _lookup_tag_id
+                mapped_genre = self._genre_mapping.get(genre)
+                tag_id = self._lookup_tag_id(mapped_genre or genre.lower(), available_tags)
                 if tag_id:
                     tags.append(tag_id)
-        
+
         # Add resolution tag
-        if media_info.get('resolution'):
-            mapped_resolution = self._resolution_mapping.get(media_info['resolution'], media_info['resolution'].lower())
-            tag_id = self._find_matching_tag_id(mapped_resolution, available_tags)
+        resolution = media_info.get('resolution')
+        if resolution:
+            mapped_resolution = self._resolution_mapping.get(resolution)
+            tag_id = self._lookup_tag_id(mapped_resolution or resolution.lower(), available_tags)
             if tag_id:
                 tags.append(tag_id)
         
         # Add video codec tag (use La Cale specific IDs)
-        if media_info.get('video_codec'):
-            mapped_codec = self._video_codec_mapping.get(media_info['video_codec'].lower())
+        if video_codec:
+            mapped_codec = self._video_codec_mapping.get(video_codec)
             if mapped_codec and mapped_codec in available_tags:
                 tags.append(mapped_codec)
             else:
                 # Fallback to name matching
-                tag_id = self._find_matching_tag_id(media_info['video_codec'].lower(), available_tags)
+                tag_id = self._find_tag_id_lower(video_codec, available_tags)
                 if tag_id:
                     tags.append(tag_id)
-        
-        # Add audio codec tag
-        if media_info.get('audio_codec'):
-            mapped_codec = self._audio_codec_mapping.get(media_info['audio_codec'].lower())
-            tag_id = self._find_matching_tag_id(mapped_codec, available_tags)
+
+        # Add audio codec tag; mapping values are tag names, not ids
+        if audio_codec:
+            mapped_codec = self._audio_codec_mapping.get(audio_codec)
+            tag_id = self._lookup_tag_id(mapped_codec or audio_codec, available_tags)
             if tag_id:
                 tags.append(tag_id)
         
         # Add language tags
         for lang in media_info.get('languages', []):
-            mapped_lang = self._language_mapping.get(lang.lower(), lang.lower())
-            tag_id = self._find_matching_tag_id(mapped_lang, available_tags)
+            code = lang.lower()
+            if self._lang_code_to_tag_id is not None and code in self._lang_code_to_tag_id:
+                tags.append(self._lang_code_to_tag_id[code])
+                continue
+            mapped_lang = self._language_mapping.get(code)
+            tag_id = self._lookup_tag_id(mapped_lang or code, available_tags)
             if tag_id:
                 tags.append(tag_id)
         
         # Add HDR tag if present
-        if media_info.get('hdr'):
-            hdr_variants = [
-                media_info['hdr'].lower(),
-                media_info['hdr'].upper(),
-                f"HDR{media_info['hdr'][2:]}" if media_info['hdr'].lower().startswith('hdr') else media_info['hdr']
-            ]
-            for hdr_variant in hdr_variants:
-                tag_id = self._find_matching_tag_id(hdr_variant, available_tags)
+        hdr_value = media_info.get('hdr')
+        if hdr_value:
+            hdr_lower = hdr_value.lower()
+            if self._hdr_tag_cache is not None and hdr_lower in self._hdr_tag_cache:
+                tags.append(self._hdr_tag_cache[hdr_lower])
+            else:
+                # Unknown label: run the variant resolution directly
+                tag_id = self._resolve_hdr_tag_id(hdr_value, available_tags)
                 if tag_id:
                     tags.append(tag_id)
-                    break
-        
+
         # Add source tag if available
-        if media_info.get('source'):
-            tag_id = self._find_matching_tag_id(media_info['source'].lower(), available_tags)
+        if source:
+            tag_id = self._find_tag_id_lower(source, available_tags)
             if tag_id:
                 tags.append(tag_id)
         
-        return list(set(tags))  # Remove duplicates
+        # Remove duplicates; dict.fromkeys keeps insertion order so the
+        # content-type tag stays first and uploads are deterministic
+        return list(dict.fromkeys(tags))
     
     def upload_from_metadata(self, metadata_path: str) -> UploadResult:
         """Upload torrent using metadata.json file from extract phase"""
         try:
-            # Load metadata
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-            
+            # Load metadata; expand_files re-pivots the columnar layout
+            with open(metadata_path, 'rb') as f:
+                metadata = MetadataManager.expand_files(_json_loads(f.read()))
+
             media_info = metadata.get('media_info', {})
             torrent_data = metadata.get('torrent_data', {})
             
@@ -497,16 +906,21 @@ class LaCaleUploader(DefaultUploader):
             # Extract tags
             tags = self._extract_tags_from_media_info(media_info, available_tags)
             
-            # Find torrent and NFO files
+            # Find torrent and NFO files; scandir avoids building a Path
+            # per entry and we can stop as soon as both are found
             metadata_dir = Path(metadata_path).parent
             torrent_file = None
             nfo_file = None
-            
-            for file_path in metadata_dir.iterdir():
-                if file_path.suffix == '.torrent':
-                    torrent_file = str(file_path)
-                elif file_path.suffix == '.nfo':
-                    nfo_file = str(file_path)
+
+            with os.scandir(metadata_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith('.torrent'):
+                        torrent_file = entry.path
+                    elif name.endswith('.nfo'):
+                        nfo_file = entry.path
+                    if torrent_file and nfo_file:
+                        break
             
             if not torrent_file:
                 return UploadResult(
@@ -574,29 +988,36 @@ class LaCaleUploader(DefaultUploader):
             return {'total': 0, 'success': 0, 'failed': 0}
         
         results = {'total': len(metadata_dirs), 'success': 0, 'failed': 0}
-        
+
         logger.info(f"Starting mass upload of {len(metadata_dirs)} torrents")
-        
-        for metadata_dir in sorted(metadata_dirs):
-            metadata_path = metadata_dir / "metadata.json"
-            logger.info(f"Processing: {metadata_dir.name}")
-            
-            try:
-                result = self.upload_from_metadata(str(metadata_path))
-                
-                if result.success:
-                    results['success'] += 1
-                    logger.info(f"✅ Successfully uploaded: {result.torrent_name}")
-                    if result.upload_id:
-                        logger.info(f"   Upload ID: {result.upload_id}")
-                else:
+
+        # Uploads are network-bound, so run them concurrently; the shared
+        # rate limiter still paces the actual API requests
+        max_workers = self.config.get('upload_concurrency', 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.upload_from_metadata, str(metadata_dir / "metadata.json")): metadata_dir
+                for metadata_dir in sorted(metadata_dirs)
+            }
+
+            for future in as_completed(futures):
+                metadata_dir = futures[future]
+                try:
+                    result = future.result()
+
+                    if result.success:
+                        results['success'] += 1
+                        logger.info(f"✅ Successfully uploaded: {result.torrent_name}")
+                        if result.upload_id:
+                            logger.info(f"   Upload ID: {result.upload_id}")
+                    else:
+                        results['failed'] += 1
+                        logger.error(f"❌ Failed to upload {metadata_dir.name}: {result.message}")
+
+                except Exception as e:
                     results['failed'] += 1
-                    logger.error(f"❌ Failed to upload {metadata_dir.name}: {result.message}")
-                    
-            except Exception as e:
-                results['failed'] += 1
-                logger.error(f"❌ Error processing {metadata_dir.name}: {e}")
-        
+                    logger.error(f"❌ Error processing {metadata_dir.name}: {e}")
+
         logger.info(f"Mass upload complete: {results['success']} success, {results['failed']} failed")
         return results
     
@@ -684,17 +1105,17 @@ class LaCaleUploader(DefaultUploader):
         if tags and isinstance(tags, list):
             form_data["tags"] = tags
         
-        # Prepare files
+        # Prepare files (memory-mapped so requests streams them zero-copy)
         files = {}
         try:
             # Add torrent file
-            files["file"] = (torrent_path.name, open(torrent_path, "rb"))
-            
+            files["file"] = (torrent_path.name, _open_upload_file(torrent_path), "application/x-bittorrent")
+
             # Add NFO file if provided
             if nfo_file_path:
                 nfo_path = Path(nfo_file_path)
                 if nfo_path.exists():
-                    files["nfoFile"] = (nfo_path.name, open(nfo_path, "rb"))
+                    files["nfoFile"] = (nfo_path.name, _open_upload_file(nfo_path))
                 else:
                     logger.warning(f"NFO file not found: {nfo_file_path}")
             
@@ -702,7 +1123,7 @@ class LaCaleUploader(DefaultUploader):
             url = f"{self.base_url}/api/external/upload"
             
             try:
-                response = requests.post(url, data=form_data, files=files, timeout=60)
+                response = self.session.post(url, data=form_data, files=files, timeout=60)
                 
                 # Process response
                 if response.status_code == 200:
@@ -770,18 +1191,20 @@ class LaCaleUploader(DefaultUploader):
                 file_obj[1].close()
     
     def validate_torrent_source(self, torrent_file_path: str) -> bool:
-        """Check if torrent contains 'LacaLe' source flag (basic check)"""
+        """Check if the torrent's bencoded source field references La Cale"""
         try:
-            # This is a basic implementation - in a full implementation,
-            # you'd parse the torrent file with bencode library
             torrent_path = Path(torrent_file_path)
             if not torrent_path.exists():
                 return False
-            
-            # For now, just check if filename suggests it's from La Cale
-            # In production, you'd parse the torrent and check source field
-            return "lacle" in torrent_path.name.lower() or "la-cale" in torrent_path.name.lower()
-            
+
+            source = _torrent_source(str(torrent_path), torrent_path.stat().st_mtime_ns)
+            if source:
+                return source.lower() in ('lacale', 'la-cale', 'la cale')
+
+            # No source field set: fall back to the old filename heuristic
+            name_lower = torrent_path.name.lower()
+            return "lacale" in name_lower or "la-cale" in name_lower
+
         except Exception as e:
             logger.warning(f"Could not validate torrent source: {e}")
             return True  # Assume valid if we can't check
@@ -4,19 +4,105 @@ Mass upload functionality for qbit2track
 
 import logging
 import json
+import mmap
+import os
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from dataclasses import dataclass
+from urllib.parse import urlparse
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from .config import Config
+from .torrent import MetadataManager
 
 
 logger = logging.getLogger(__name__)
 
+# orjson is several times faster than the stdlib for metadata-sized
+# documents; fall back transparently when it is not installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'))
+
+# requests_toolbelt streams multipart bodies straight from disk in small
+# chunks instead of buffering whole files in memory; optional dependency
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# httpx provides HTTP/2 multiplexing: one TLS handshake per host shared
+# by uploads and status polls; optional, requests remains the fallback
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Optional media_info fields copied verbatim into the upload form when set
+_OPTIONAL_MEDIA_FIELDS = (
+    'year', 'resolution', 'video_codec', 'audio_codec',
+    'tmdb_id', 'imdb_id', 'season', 'episode'
+)
+
+
+def _compile_media_field_filler():
+    """exec-compile a straight-line filler for the optional media fields
+
+    The per-upload cost becomes a flat sequence of dict probes and
+    stores with no Python-level loop; returns None if compilation fails
+    so callers keep the generic if-chain.
+    """
+    lines = ["def _fill(media_info, data):"]
+    for key in _OPTIONAL_MEDIA_FIELDS:
+        lines.append(f"    v = media_info.get({key!r})")
+        lines.append(f"    if v: data[{key!r}] = v")
+    namespace = {}
+    try:
+        exec("\n".join(lines), {}, namespace)
+        return namespace['_fill']
+    except Exception:
+        return None
+
+
+_FILL_MEDIA_FIELDS = _compile_media_field_filler()
+
+# Files above this size are memory-mapped for upload; below it the mmap
+# setup costs more than it saves
+_MMAP_THRESHOLD = 1 << 20
+
+
+def _open_for_upload(path_str: str, stack: ExitStack):
+    """Open a file for upload, memory-mapping it past the size threshold
+
+    A read-only mapping lets the HTTP stack send straight from the page
+    cache without a user-space copy; both the mapping and the backing
+    handle are registered on the caller's ExitStack.
+    """
+    f = stack.enter_context(open(path_str, 'rb'))
+    if os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+        return stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    return f
+
+
+# Pooled sessions shared across API clients, keyed by host so uploads and
+# status polls to the same tracker reuse one keep-alive connection pool
+_SESSIONS: Dict[str, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
 
 @dataclass
 class UploadResult:
@@ -29,37 +115,53 @@ class UploadResult:
 
 
 class RateLimiter:
-    """Simple rate limiter for API requests"""
-    
+    """Token-bucket rate limiter for API requests
+
+    The bucket refills at requests_per_minute and holds at most
+    burst_size tokens, so short bursts are allowed while sustained
+    traffic converges on the configured rate. Each call costs O(1)
+    arithmetic and constant memory, unlike the previous sliding-window
+    list that was rescanned per request.
+    """
+
     def __init__(self, requests_per_minute: int = 30, burst_size: int = 5):
         self.requests_per_minute = requests_per_minute
         self.burst_size = burst_size
-        self.requests = []
-        self.lock = False
-    
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst_size)
+        self.tokens = float(burst_size)
+        # Monotonic clock: immune to wall-clock jumps (NTP, DST)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
     def wait_if_needed(self):
-        """Wait if rate limit would be exceeded"""
-        now = time.time()
-        
-        # Remove old requests (older than 1 minute)
-        self.requests = [req_time for req_time in self.requests if now - req_time < 60]
-        
-        # Check if we would exceed the limit
-        if len(self.requests) >= self.requests_per_minute:
-            sleep_time = 60 - (now - self.requests[0])
-            if sleep_time > 0:
+        """Consume a token, sleeping until one is available"""
+        # Holding the lock while sleeping intentionally serializes
+        # concurrent callers: they must queue behind the rate limit anyway
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+
+            if self.tokens < 1.0:
+                sleep_time = (1.0 - self.tokens) / self.rate
                 logger.info(f"Rate limit reached, waiting {sleep_time:.1f} seconds")
                 time.sleep(sleep_time)
-        
-        # Check burst limit
-        recent_requests = [req_time for req_time in self.requests if now - req_time < 5]
-        if len(recent_requests) >= self.burst_size:
-            sleep_time = 5 - (now - recent_requests[0])
-            if sleep_time > 0:
-                logger.info(f"Burst limit reached, waiting {sleep_time:.1f} seconds")
-                time.sleep(sleep_time)
-        
-        self.requests.append(now)
+                self.last_refill = time.monotonic()
+                self.tokens = 0.0
+            else:
+                self.tokens -= 1.0
+
+    def penalize(self, seconds: float):
+        """Push the bucket into debt for a server-imposed wait
+
+        Used for 429 responses: the natural refill absorbs the penalty,
+        so subsequent callers queue in wait_if_needed instead of an
+        out-of-band sleep here.
+        """
+        with self.lock:
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+            self.last_refill = time.monotonic()
 
 
 class APIClient:
@@ -69,47 +171,98 @@ class APIClient:
         self.tracker_name = tracker_name
         self.config = config
         self.session = self._create_session()
+        self._httpx_client = self._create_httpx_client()
+        self._build_request_auth()
+        # Status URL template resolved once; None when no status endpoint
+        # is configured
+        endpoints = config.get('endpoints', {})
+        self._status_url_tmpl = (
+            config.get('base_url', '') + endpoints.get('status', '/status/{upload_id}')
+            if 'status' in endpoints else None
+        )
         self.rate_limiter = RateLimiter(
             requests_per_minute=config.get('rate_limit', {}).get('requests_per_minute', 30),
             burst_size=config.get('rate_limit', {}).get('burst_size', 5)
         )
     
     def _create_session(self) -> requests.Session:
-        """Create HTTP session with retry strategy"""
-        session = requests.Session()
-        
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=self.config.get('retry', {}).get('max_attempts', 3),
-            backoff_factor=self.config.get('retry', {}).get('backoff_factor', 2),
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Set headers
-        headers = self.config.get('headers', {})
-        for key, value in headers.items():
-            session.headers[key] = value
-        
-        # Configure authentication
+        """Return the pooled session shared by all clients on this host
+
+        Sessions carry no per-client state: headers and auth are passed
+        per request so trackers on the same host can share one TCP/TLS
+        connection pool. The retry strategy of the first client to hit a
+        host configures its session.
+        """
+        netloc = urlparse(self.config.get('base_url', '')).netloc
+
+        with _SESSIONS_LOCK:
+            session = _SESSIONS.get(netloc)
+            if session is None:
+                session = requests.Session()
+
+                # Configure retry strategy
+                # 429 is deliberately absent: the RateLimiter owns pacing,
+                # so urllib3 must not also sleep on rate-limit responses
+                retry_strategy = Retry(
+                    total=self.config.get('retry', {}).get('max_attempts', 3),
+                    backoff_factor=self.config.get('retry', {}).get('backoff_factor', 2),
+                    status_forcelist=[500, 502, 503, 504],
+                )
+
+                adapter = HTTPAdapter(
+                    max_retries=retry_strategy,
+                    pool_connections=16,
+                    pool_maxsize=16
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+
+                _SESSIONS[netloc] = session
+
+        return session
+
+    def _create_httpx_client(self) -> Optional["httpx.Client"]:
+        """Create an HTTP/2 client when httpx (with its h2 extra) is available
+
+        HTTP/2 multiplexes uploads and status polls over one connection
+        per host, so concurrent requests share a single TLS handshake.
+        Returns None when the optional dependency is missing; callers
+        then use the pooled requests session.
+        """
+        if httpx is None:
+            return None
+
+        try:
+            return httpx.Client(
+                http2=True,
+                timeout=self.config.get('timeout', 30),
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+            )
+        except ImportError:
+            # http2=True needs the h2 package; fall back to requests
+            return None
+
+    def _build_request_auth(self) -> None:
+        """Compute the per-request headers and auth for this client"""
+        headers = dict(self.config.get('headers', {}))
+
         auth_config = self.config.get('auth', {})
         auth_type = auth_config.get('type', 'none')
-        
+
+        self._auth: Optional[Tuple[str, str]] = None
         if auth_type == 'api_key':
             api_key = auth_config.get('api_key')
             if api_key:
-                session.headers['Authorization'] = f'Bearer {api_key}'
+                headers['Authorization'] = f'Bearer {api_key}'
         elif auth_type == 'basic':
-            session.auth = (
+            self._auth = (
                 auth_config.get('username', ''),
                 auth_config.get('password', '')
             )
-        
-        return session
-    
+
+        self._headers = headers
+
+
     def upload_torrent(self, torrent_data: Dict[str, Any], files: Dict[str, Any]) -> UploadResult:
         """Upload torrent to tracker"""
         self.rate_limiter.wait_if_needed()
@@ -117,38 +270,63 @@ class APIClient:
         upload_url = self.config['base_url'] + self.config['endpoints']['upload']
         
         try:
-            # Prepare files for upload
-            files_to_upload = {}
-            
-            # Add torrent file
-            torrent_file_path = files.get('torrent_file')
-            if torrent_file_path and Path(torrent_file_path).exists():
-                files_to_upload['torrent'] = open(torrent_file_path, 'rb')
-            
-            # Add NFO file if exists
-            nfo_file_path = files.get('nfo_file')
-            if nfo_file_path and Path(nfo_file_path).exists():
-                files_to_upload['nfo'] = open(nfo_file_path, 'rb')
-            
-            # Prepare data
-            data = self._prepare_upload_data(torrent_data)
-            
-            # Make request
-            timeout = self.config.get('timeout', 30)
-            response = self.session.post(
-                upload_url,
-                files=files_to_upload,
-                data=data,
-                timeout=timeout
-            )
-            
-            # Close files
-            for file_obj in files_to_upload.values():
-                file_obj.close()
-            
+            # ExitStack closes every opened handle on all exit paths,
+            # keeping the FD footprint bounded during mass uploads
+            with ExitStack() as stack:
+                # Prepare files for upload: field name -> (filename, handle, mimetype)
+                files_to_upload = {}
+
+                # Paths were discovered by the caller's directory scan, so
+                # trust them instead of re-stat-ing; a racing delete
+                # surfaces as an open() error on the normal failure path
+
+                # Add torrent file
+                torrent_file_path = files.get('torrent_file')
+                if torrent_file_path:
+                    files_to_upload['torrent'] = (
+                        Path(torrent_file_path).name,
+                        _open_for_upload(torrent_file_path, stack),
+                        'application/x-bittorrent'
+                    )
+
+                # Add NFO file if exists
+                nfo_file_path = files.get('nfo_file')
+                if nfo_file_path:
+                    files_to_upload['nfo'] = (
+                        Path(nfo_file_path).name,
+                        _open_for_upload(nfo_file_path, stack),
+                        'text/plain'
+                    )
+
+                # Prepare data
+                data = self._prepare_upload_data(torrent_data)
+
+                # Make request
+                timeout = self.config.get('timeout', 30)
+                response = self._post_multipart(upload_url, data, files_to_upload, timeout)
+
             # Process response
+            if response.status_code == 429:
+                # Feed the server-imposed wait back into the token bucket
+                # and let the caller reschedule
+                try:
+                    penalty = float(response.headers.get('Retry-After', '1'))
+                except ValueError:
+                    penalty = 1.0
+                self.rate_limiter.penalize(penalty)
+                return UploadResult(
+                    torrent_name=torrent_data['media_info']['title'],
+                    success=False,
+                    message=f"Rate limited by tracker (retry after {penalty:.0f}s)"
+                )
+
             if response.status_code in [200, 201]:
-                result_data = response.json() if response.content else {}
+                # Decode the body once with the fast loader instead of
+                # going through response.json()'s stdlib pass
+                try:
+                    result_data = _json_loads(response.content) if response.content else {}
+                except ValueError:
+                    result_data = {}
                 return UploadResult(
                     torrent_name=torrent_data['media_info']['title'],
                     success=True,
@@ -177,6 +355,46 @@ class APIClient:
                 message=f"Upload error: {str(e)}"
             )
     
+    def _post_multipart(self, upload_url: str, data: Dict[str, Any],
+                        files_to_upload: Dict[str, Tuple], timeout: int) -> Any:
+        """POST the upload form, streaming file bodies when possible
+
+        Prefers the HTTP/2 client when available; with requests_toolbelt
+        installed the multipart body is streamed from disk in small
+        chunks, keeping peak memory independent of torrent/NFO size;
+        otherwise requests' in-memory encoding is used. requests and
+        httpx responses expose the same status_code/content/json surface.
+        """
+        if self._httpx_client is not None:
+            return self._httpx_client.post(
+                upload_url,
+                files=files_to_upload,
+                data=data,
+                headers=self._headers,
+                auth=self._auth
+            )
+
+        if MultipartEncoder is not None and files_to_upload:
+            fields = {key: str(value) for key, value in data.items()}
+            fields.update(files_to_upload)
+            encoder = MultipartEncoder(fields=fields)
+            return self.session.post(
+                upload_url,
+                data=encoder,
+                headers={**self._headers, 'Content-Type': encoder.content_type},
+                auth=self._auth,
+                timeout=timeout
+            )
+
+        return self.session.post(
+            upload_url,
+            files=files_to_upload,
+            data=data,
+            headers=self._headers,
+            auth=self._auth,
+            timeout=timeout
+        )
+
     def _prepare_upload_data(self, torrent_data: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare data for upload request"""
         media_info = torrent_data['media_info']
@@ -191,96 +409,102 @@ class APIClient:
             'size': torrent_data['torrent']['size']
         }
         
-        # Add media-specific fields
-        if media_info.get('year'):
-            data['year'] = media_info['year']
-        
-        if media_info.get('resolution'):
-            data['resolution'] = media_info['resolution']
-        
-        if media_info.get('video_codec'):
-            data['video_codec'] = media_info['video_codec']
-        
-        if media_info.get('audio_codec'):
-            data['audio_codec'] = media_info['audio_codec']
-        
-        if media_info.get('tmdb_id'):
-            data['tmdb_id'] = media_info['tmdb_id']
-        
-        if media_info.get('imdb_id'):
-            data['imdb_id'] = media_info['imdb_id']
-        
-        # TV show specific
-        if media_info.get('season'):
-            data['season'] = media_info['season']
-        
-        if media_info.get('episode'):
-            data['episode'] = media_info['episode']
+        # Add media-specific fields (incl. season/episode for TV shows)
+        if _FILL_MEDIA_FIELDS is not None:
+            _FILL_MEDIA_FIELDS(media_info, data)
+        else:
+            for key in _OPTIONAL_MEDIA_FIELDS:
+                value = media_info.get(key)
+                if value:
+                    data[key] = value
         
-        # TMDB data
+        # TMDB data; serialized once per torrent and reused across
+        # trackers and retries since metadata is never mutated
         if tmdb_data:
-            data['tmdb_data'] = json.dumps(tmdb_data)
-        
+            tmdb_json = torrent_data.get('_tmdb_json')
+            if tmdb_json is None:
+                tmdb_json = _json_dumps(tmdb_data)
+                torrent_data['_tmdb_json'] = tmdb_json
+            data['tmdb_data'] = tmdb_json
+
         return data
     
     def _generate_description(self, torrent_data: Dict[str, Any]) -> str:
-        """Generate upload description"""
+        """Generate upload description; cached per torrent across trackers"""
+        cached = torrent_data.get('_description')
+        if cached is not None:
+            return cached
+
         media_info = torrent_data['media_info']
         tmdb_data = torrent_data.get('tmdb_data', {})
-        
-        description = f"**{media_info['title']}**\n\n"
-        
+
+        # Collect segments and join once instead of repeated += on str
+        parts = [f"**{media_info['title']}**\n\n"]
+
         # Add basic info
         if media_info.get('year'):
-            description += f"**Year:** {media_info['year']}\n"
-        
-        description += f"**Type:** {media_info['type']}\n"
-        
+            parts.append(f"**Year:** {media_info['year']}\n")
+
+        parts.append(f"**Type:** {media_info['type']}\n")
+
         # Add technical details
         if media_info.get('resolution'):
-            description += f"**Resolution:** {media_info['resolution']}\n"
-        
+            parts.append(f"**Resolution:** {media_info['resolution']}\n")
+
         if media_info.get('video_codec'):
-            description += f"**Video Codec:** {media_info['video_codec']}\n"
-        
+            parts.append(f"**Video Codec:** {media_info['video_codec']}\n")
+
         if media_info.get('audio_codec'):
-            description += f"**Audio Codec:** {media_info['audio_codec']}\n"
-        
+            parts.append(f"**Audio Codec:** {media_info['audio_codec']}\n")
+
         if media_info.get('languages'):
-            description += f"**Languages:** {', '.join(media_info['languages'])}\n"
-        
+            parts.append(f"**Languages:** {', '.join(media_info['languages'])}\n")
+
         # Add TMDB info
         if tmdb_data and tmdb_data.get('overview'):
-            description += f"\n**Overview:**\n{tmdb_data['overview']}\n"
-        
+            parts.append(f"\n**Overview:**\n{tmdb_data['overview']}\n")
+
         # Add genres
         if tmdb_data and tmdb_data.get('genres'):
-            description += f"\n**Genres:** {', '.join(tmdb_data['genres'])}\n"
-        
+            parts.append(f"\n**Genres:** {', '.join(tmdb_data['genres'])}\n")
+
         # Add original info
-        description += f"\n*Original source: qBittorrent ({torrent_data['torrent']['hash'][:8]})*"
-        
+        parts.append(f"\n*Original source: qBittorrent ({torrent_data['torrent']['hash'][:8]})*")
+
+        description = ''.join(parts)
+        torrent_data['_description'] = description
         return description
     
     def _get_status_url(self, upload_id: Optional[str]) -> Optional[str]:
         """Get status check URL for upload"""
-        if not upload_id:
+        if not upload_id or self._status_url_tmpl is None:
             return None
-        
-        status_endpoint = self.config['endpoints'].get('status', '/status/{upload_id}')
-        return self.config['base_url'] + status_endpoint.format(upload_id=upload_id)
-    
+
+        return self._status_url_tmpl.format(upload_id=upload_id)
+
     def check_upload_status(self, upload_id: str) -> Dict[str, Any]:
         """Check upload status"""
-        if 'status' not in self.config['endpoints']:
+        if self._status_url_tmpl is None:
             return {'status': 'unknown', 'message': 'Status endpoint not configured'}
-        
+
         status_url = self._get_status_url(upload_id)
         if not status_url:
             return {'status': 'error', 'message': 'Could not create status URL'}
         
         try:
-            response = self.session.get(status_url, timeout=self.config.get('timeout', 30))
+            if self._httpx_client is not None:
+                response = self._httpx_client.get(
+                    status_url,
+                    headers=self._headers,
+                    auth=self._auth
+                )
+            else:
+                response = self.session.get(
+                    status_url,
+                    headers=self._headers,
+                    auth=self._auth,
+                    timeout=self.config.get('timeout', 30)
+                )
             if response.status_code == 200:
                 return response.json()
             else:
@@ -308,45 +532,76 @@ class MassUploader:
         if not output_dir.exists():
             raise FileNotFoundError(f"Output directory not found: {output_dir}")
         
-        # Find all torrent directories
-        torrent_dirs = [d for d in output_dir.iterdir() if d.is_dir() and (d / "metadata.json").exists()]
+        # Find all torrent directories; scandir reuses the readdir d_type
+        # instead of stat-ing a Path object per entry
+        with os.scandir(output_dir) as entries:
+            torrent_dirs = [
+                Path(entry.path) for entry in entries
+                if entry.is_dir(follow_symlinks=False)
+                and os.path.exists(os.path.join(entry.path, "metadata.json"))
+            ]
         
         if not torrent_dirs:
             logger.warning("No extracted torrents found")
             return {'total': 0, 'success': 0, 'failed': 0}
         
         results = {'total': len(torrent_dirs), 'success': 0, 'failed': 0}
-        
-        for torrent_dir in torrent_dirs:
+
+        # Read every metadata.json up front in one concurrent I/O wave so
+        # the upload workers never stall on local disk between requests
+        def read_metadata(torrent_dir: Path) -> Optional[Dict[str, Any]]:
             try:
-                if self._upload_single_torrent(torrent_dir, tracker_name, dry_run):
-                    results['success'] += 1
-                else:
+                with open(torrent_dir / "metadata.json", 'rb') as f:
+                    return MetadataManager.expand_files(_json_loads(f.read()))
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to read metadata for {torrent_dir.name}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            metadatas = dict(zip(torrent_dirs, executor.map(read_metadata, torrent_dirs)))
+
+        results['failed'] += sum(1 for metadata in metadatas.values() if metadata is None)
+
+        # Uploads are latency-bound: overlap the round trips with a small
+        # thread pool sharing the pooled sessions; the rate limiter still
+        # throttles the aggregate request rate
+        max_workers = max(1, self.config.app.upload_concurrency)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._upload_single_torrent, torrent_dir, metadata, tracker_name, dry_run): torrent_dir
+                for torrent_dir, metadata in metadatas.items()
+                if metadata is not None
+            }
+            for future in as_completed(futures):
+                torrent_dir = futures[future]
+                try:
+                    if future.result():
+                        results['success'] += 1
+                    else:
+                        results['failed'] += 1
+                except Exception as e:
                     results['failed'] += 1
-            except Exception as e:
-                results['failed'] += 1
-                logger.error(f"Failed to upload {torrent_dir.name}: {e}")
-        
+                    logger.error(f"Failed to upload {torrent_dir.name}: {e}")
+
         return results
     
-    def _upload_single_torrent(self, torrent_dir: Path, tracker_name: Optional[str], dry_run: bool) -> bool:
-        """Upload a single torrent"""
-        # Load metadata
-        metadata_file = torrent_dir / "metadata.json"
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            torrent_data = json.load(f)
-        
+    def _upload_single_torrent(self, torrent_dir: Path, torrent_data: Dict[str, Any],
+                               tracker_name: Optional[str], dry_run: bool) -> bool:
+        """Upload a single torrent from its preloaded metadata"""
         # Find files
         files = {
             'torrent_file': None,
             'nfo_file': None
         }
         
-        for file_path in torrent_dir.iterdir():
-            if file_path.suffix == '.torrent':
-                files['torrent_file'] = str(file_path)
-            elif file_path.suffix == '.nfo':
-                files['nfo_file'] = str(file_path)
+        # One scandir pass; no per-entry Path construction or stat
+        with os.scandir(torrent_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith('.torrent'):
+                    files['torrent_file'] = entry.path
+                elif name.endswith('.nfo'):
+                    files['nfo_file'] = entry.path
         
         if not files['torrent_file']:
             logger.warning(f"No torrent file found in {torrent_dir}")
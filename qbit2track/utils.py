@@ -4,46 +4,64 @@ Utility functions for qbit2track
 import os
 import json
 from datetime import datetime
-from dataclasses import asdict
+from dataclasses import is_dataclass
 from typing import Optional
 
 class TMDBObject:
-    """Wrapper class to allow dict-like access with attribute syntax for TMDB objects"""
+    """Wrapper class to allow dict-like access with attribute syntax for TMDB objects
+
+    Data keys are copied straight into the instance __dict__, so
+    attribute access resolves through the normal C-level lookup instead
+    of bouncing through a Python __getattr__ on every read.
+    """
     def __init__(self, data):
-        self._data = data if isinstance(data, dict) else {}
-    
-    def __getattr__(self, name):
-        if name in self._data:
-            return self._data[name]
-        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
-    
+        if isinstance(data, dict):
+            self.__dict__.update(data)
+
     def __getitem__(self, key):
-        return self._data[key]
-    
+        return self.__dict__[key]
+
     def __contains__(self, key):
-        return key in self._data
-    
+        return key in self.__dict__
+
     def get(self, key, default=None):
-        return self._data.get(key, default)
-    
+        return self.__dict__.get(key, default)
+
     def keys(self):
-        return self._data.keys()
-    
+        return self.__dict__.keys()
+
     def values(self):
-        return self._data.values()
-    
+        return self.__dict__.values()
+
     def items(self):
-        return self._data.items()
+        return self.__dict__.items()
+
+
+# Exact-type dispatch for the encoder: one C-level dict probe instead of
+# an isinstance chain for the common cases
+_JSON_ENCODERS = {
+    datetime: datetime.isoformat,
+    TMDBObject: lambda obj: obj.__dict__,
+}
 
 
 class CustomJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder for datetime objects, dataclasses, and TMDB objects"""
     def default(self, obj):
+        encode = _JSON_ENCODERS.get(type(obj))
+        if encode is not None:
+            return encode(obj)
+        # Shallow __dict__ is enough for dataclasses: nested non-JSON
+        # values come back through default(), unlike asdict's deep copy
+        if is_dataclass(obj):
+            return obj.__dict__
+        # Subclasses miss the exact-type table above
         if isinstance(obj, datetime):
             return obj.isoformat()
-        elif hasattr(obj, '__dataclass_fields__'):  # Handle dataclasses
-            return asdict(obj)
-        elif hasattr(obj, '__dict__') and not hasattr(obj, '__dataclass_fields__'):  # Handle TMDB objects
+        if isinstance(obj, TMDBObject):
+            return obj.__dict__
+        # Other attribute-bag objects (e.g. tmdbv3api results)
+        if hasattr(obj, '__dict__'):
             return {k: v for k, v in obj.__dict__.items() if not k.startswith('_')}
         return super().default(obj)
 
@@ -65,6 +83,20 @@ def custom_json_decoder(obj):
     
     return obj
 
+def content_unchanged(file_path, data: bytes) -> bool:
+    """Check whether a file already holds exactly the given bytes
+
+    Used to skip rewriting output files on reruns; the size check avoids
+    reading the old content unless the lengths already match.
+    """
+    try:
+        if file_path.stat().st_size != len(data):
+            return False
+        return file_path.read_bytes() == data
+    except OSError:
+        return False
+
+
 def line_separator(title: Optional[str] = None) -> str:
     if title:
         return f"=== {title} " + "=" * (os.get_terminal_size().columns - len(f"=== {title} "))